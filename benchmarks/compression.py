@@ -0,0 +1,49 @@
+"""Benchmark of the CPU cost and the I/O savings of the database file compression formats
+
+Usage:
+    python benchmarks/compression.py [rows]
+"""
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from lightdb import LightDB
+from lightdb.compression import COMPRESSIONS
+
+
+def make_rows(count: int) -> list:
+    return [
+        {"_id": str(index), "name": f"User {index}", "age": index % 90, "items": ["a", "b"], "extra": {"active": index % 2 == 0}}
+        for index in range(count)
+    ]
+
+
+def main(count: int) -> None:
+    rows = make_rows(count)
+
+    print(f"{'compression':<12} {'size, KiB':>10} {'ratio':>7} {'save, s':>9} {'load, s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        plain_size = None
+        for compression in (None, *COMPRESSIONS):
+            location = Path(directory) / f"{compression}.json"
+            db = LightDB(str(location), compression=compression)
+            db.set("users", rows)
+
+            started = time.perf_counter()
+            db.save()
+            save_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            LightDB(str(location))
+            load_time = time.perf_counter() - started
+
+            size = location.stat().st_size
+            plain_size = plain_size or size
+            print(f"{compression or 'none':<12} {size / 1024:>10.1f} {plain_size / size:>7.1f} {save_time:>9.3f} {load_time:>9.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
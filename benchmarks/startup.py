@@ -0,0 +1,50 @@
+"""Benchmark of the database startup time with and without the snapshot sidecar
+
+Usage:
+    python benchmarks/startup.py [rows]
+"""
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from lightdb import LightDB
+
+
+def make_rows(count: int) -> list:
+    return [
+        {"_id": str(index), "name": f"User {index}", "age": index % 90, "items": ["a", "b"], "extra": {"active": index % 2 == 0}}
+        for index in range(count)
+    ]
+
+
+def measure(location: Path, snapshot: bool, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        LightDB(str(location), snapshot=snapshot)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        location = Path(directory) / "db.json"
+        db = LightDB(str(location), snapshot=True)
+        db.set("users", make_rows(count))
+        db.save()
+        LightDB(str(location), snapshot=True)
+
+        json_time = measure(location, snapshot=False)
+        snapshot_time = measure(location, snapshot=True)
+
+        print(f"{'load':<10} {'time, s':>9}")
+        print(f"{'json':<10} {json_time:>9.3f}")
+        print(f"{'snapshot':<10} {snapshot_time:>9.3f}")
+        print(f"speedup: {json_time / snapshot_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
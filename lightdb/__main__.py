@@ -0,0 +1,69 @@
+"""A file containing the command line interface for bulk import and export of tables
+
+Usage:
+    python -m lightdb export db.json users users.ndjson
+    python -m lightdb import db.json users users.ndjson
+
+The command line import has no access to the models, so rows are stored as they are, without
+validation against the model fields. Rows without an ``_id`` get a random UUID, as models do by default.
+"""
+
+import argparse
+
+from typing import Any, Dict, List, Optional
+
+from . import ids
+from .core import LightDB
+
+
+def _with_id(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Assign a new id to an imported row that has none
+
+    Params:
+        row (``Dict[str, Any]``): The imported row
+
+    Returns:
+        ``Dict[str, Any]``: The row with an ``_id``
+    """
+    if "_id" not in row:
+        row["_id"] = ids.uuid4()
+    return row
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface
+
+    Params:
+        argv (``List[str]``, optional): The command line arguments. Defaults to ``sys.argv[1:]``
+
+    Returns:
+        ``int``: The exit code of the command
+    """
+    parser = argparse.ArgumentParser(prog="lightdb", description="Bulk import and export of LightDB tables")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Export a table to an NDJSON file")
+    import_parser = commands.add_parser("import", help="Import an NDJSON file into a table, without validation")
+
+    for command_parser in (export_parser, import_parser):
+        command_parser.add_argument("database", help="The path to the JSON database file")
+        command_parser.add_argument("table", help="The name of the table")
+        command_parser.add_argument("path", help="The path to the NDJSON file")
+
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="The number of rows to read at once")
+
+    args = parser.parse_args(argv)
+    db = LightDB(args.database)
+
+    if args.command == "export":
+        count = db.export_table(args.table, args.path)
+        print(f"Exported {count} rows from `{args.table}` to {args.path}")
+    else:
+        count = db.import_table(args.table, args.path, batch_size=args.batch_size, prepare=_with_id)
+        print(f"Imported {count} rows from {args.path} into `{args.table}`")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
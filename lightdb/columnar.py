@@ -0,0 +1,119 @@
+"""A file containing the implementation of the columnar table representation used for vectorized filtering"""
+
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Tuple
+
+from .query import OPERATORS_MAP
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from .fields import Field
+    from .query import Condition
+
+COLUMN_TYPES = {
+    bool: "bool",
+    int: "int64",
+    float: "float64",
+    str: "str"
+}
+"""A mapping of supported scalar field annotations to NumPy dtypes"""
+
+NUMERIC_TYPES = (int, float)
+
+
+class ColumnStore:
+    """A class holding one typed NumPy array per scalar field of a table"""
+
+    def __init__(self, fields: Dict[str, "Field"], rows: List[Dict[str, Any]], key: Hashable = None) -> None:
+        """Build the columns of a table from its rows
+
+        Fields whose annotation is not a supported scalar type, or whose stored values do not all
+        match the annotation (e.g. missing values), get no column and are evaluated row by row
+
+        Params:
+            fields (``Dict[str, Field]``): The fields of the model
+
+            rows (``List[Dict[str, Any]]``): The stored rows of the table
+
+            key (``Hashable``, optional): A key identifying the state of the rows the store was built from
+        """
+        if np is None:
+            raise ImportError("NumPy is required for columnar tables")
+
+        self.key = key
+        self.size = len(rows)
+        self.columns: Dict[str, "np.ndarray"] = {}
+
+        for name, field in fields.items():
+            dtype = COLUMN_TYPES.get(field.annotation)
+            if dtype is None:
+                continue
+
+            values = [row.get(name, field.default) for row in rows]
+            if not all(isinstance(value, field.annotation) for value in values):
+                continue
+
+            try:
+                self.columns[name] = np.array(values, dtype=dtype)
+            except (TypeError, ValueError, OverflowError):
+                continue
+
+    def __repr__(self) -> str:
+        return f"ColumnStore(size={self.size}, columns={list(self.columns)})"
+
+    def mask(self, condition: "Condition") -> Optional["np.ndarray"]:
+        """Evaluate a condition against a whole column at once
+
+        Params:
+            condition (``Condition``): The condition to evaluate
+
+        Returns:
+            ``np.ndarray`` | ``None``: A boolean mask of the matching rows, or None if the condition can't be vectorized
+        """
+        column = self.columns.get(condition.field.name)
+        if column is None:
+            return None
+
+        value = condition.value
+        if column.dtype.kind in "if":
+            if isinstance(value, bool) or not isinstance(value, NUMERIC_TYPES):
+                return None
+        elif condition.op not in ("==", "!="):
+            return None
+        elif column.dtype.kind == "b" and not isinstance(value, bool):
+            return None
+        elif column.dtype.kind == "U" and not isinstance(value, str):
+            return None
+
+        try:
+            return OPERATORS_MAP[condition.op](column, value)
+        except (TypeError, OverflowError):
+            return None
+
+    def select(self, conditions: List["Condition"]) -> Optional[Tuple[List[int], List["Condition"]]]:
+        """Evaluate every vectorizable condition and combine the results
+
+        Params:
+            conditions (``List[Condition]``): The conditions of a query
+
+        Returns:
+            ``Tuple[List[int], List[Condition]]`` | ``None``: The indexes of the candidate rows and the conditions
+                that still have to be evaluated row by row, or None if no condition could be vectorized
+        """
+        mask = None
+        remaining = []
+
+        for condition in conditions:
+            condition_mask = self.mask(condition)
+            if condition_mask is None:
+                remaining.append(condition)
+            else:
+                mask = condition_mask if mask is None else mask & condition_mask
+
+        if mask is None:
+            return None
+
+        return np.flatnonzero(mask).tolist(), remaining
@@ -0,0 +1,123 @@
+"""A file containing the streaming compression support for database files"""
+
+import gzip
+import io
+import lzma
+import zlib
+
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO, Union
+
+COMPRESSIONS = ("zlib", "gzip", "lzma")
+"""The names of the supported compression formats"""
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ZlibFile(io.RawIOBase):
+    """A file object streaming data through a zlib compressor or decompressor"""
+
+    def __init__(self, file: BinaryIO, mode: str) -> None:
+        """Initialize the zlib file object
+
+        Params:
+            file (``BinaryIO``): The underlying binary file
+
+            mode (``str``): The file mode, ``"rb"`` or ``"wb"``
+        """
+        super().__init__()
+        self.file = file
+        self.mode = mode
+        self._compressor = zlib.compressobj() if mode == "wb" else None
+        self._decompressor = zlib.decompressobj() if mode == "rb" else None
+        self._buffer = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return self._decompressor is not None
+
+    def writable(self) -> bool:
+        return self._compressor is not None
+
+    def readinto(self, buffer: bytearray) -> int:
+        while self._offset >= len(self._buffer) and not self._decompressor.eof:
+            chunk = self.file.read(CHUNK_SIZE)
+            self._buffer = self._decompressor.decompress(chunk) if chunk else self._decompressor.flush()
+            self._offset = 0
+            if not chunk:
+                break
+
+        size = min(len(buffer), len(self._buffer) - self._offset)
+        buffer[:size] = self._buffer[self._offset:self._offset + size]
+        self._offset += size
+        return size
+
+    def write(self, data: bytes) -> int:
+        self.file.write(self._compressor.compress(data))
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            if self._compressor is not None:
+                self.file.write(self._compressor.flush())
+        finally:
+            self.file.close()
+            super().close()
+
+
+def detect_compression(path: Union[str, Path]) -> Optional[str]:
+    """Detect the compression format of a file by its leading bytes
+
+    Params:
+        path (``str`` | ``Path``): The path to the file
+
+    Returns:
+        ``str`` | ``None``: The name of the compression format, or None for plain text files
+    """
+    with Path(path).open("rb") as file:
+        header = file.read(6)
+
+    if header.startswith(b"\x1f\x8b"):
+        return "gzip"
+    if header.startswith(b"\xfd7zXZ\x00"):
+        return "lzma"
+    if len(header) >= 2 and header[0] & 0x0F == 8 and (header[0] << 8 | header[1]) % 31 == 0:
+        return "zlib"
+    return None
+
+
+def open_text(path: Union[str, Path], mode: str, compression: Optional[str] = None) -> TextIO:
+    """Open a UTF-8 text file, streaming its content through the given compression
+
+    Params:
+        path (``str`` | ``Path``): The path to the file
+
+        mode (``str``): The file mode, ``"r"`` or ``"w"``
+
+        compression (``str``, optional): One of ``COMPRESSIONS``, or None for plain text.
+            When reading, the compression is detected from the file if not given
+
+    Returns:
+        ``TextIO``: A text file object
+    """
+    if mode not in ("r", "w"):
+        raise ValueError(f"Unsupported file mode `{mode}`")
+
+    if mode == "r" and compression is None:
+        compression = detect_compression(path)
+
+    if compression is None:
+        return Path(path).open(mode, encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    if compression == "lzma":
+        return lzma.open(path, f"{mode}t", encoding="utf-8")
+    if compression == "zlib":
+        raw = ZlibFile(Path(path).open(f"{mode}b"), f"{mode}b")
+        buffered = io.BufferedReader(raw, CHUNK_SIZE) if mode == "r" else io.BufferedWriter(raw, CHUNK_SIZE)
+        return io.TextIOWrapper(buffered, encoding="utf-8")
+
+    raise ValueError(f"Unsupported compression `{compression}`, expected one of {', '.join(COMPRESSIONS)}")
@@ -1,14 +1,45 @@
 """A file that containing the main implementation of the LightDB database management system"""
 
+import copy
+import gc
+import hashlib
+import itertools
 import json
+import pickle
+import shutil
+import zlib
 
+from collections import OrderedDict, deque
+from collections.abc import ItemsView, KeysView, ValuesView
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, TypeVar, Union, overload
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union, overload
+
+from .compression import COMPRESSIONS, detect_compression, open_text
+from .exceptions import ChangesExpiredError
+from .ids import SEQUENCES_KEY
 
 _T = TypeVar("_T")
 _VT = TypeVar("_VT")
 
 
+class Change(NamedTuple):
+    """A single mutation of a table"""
+
+    seq: int
+    """The sequence number of the change, increasing by one with every change of the database"""
+
+    table: str
+    """The name of the changed table"""
+
+    op: str
+    """The kind of the change, one of ``"insert"``, ``"update"`` or ``"delete"``"""
+
+    data: Any
+    """A copy of the inserted, updated or deleted row or value. None for whole tables set or popped
+    through the database, which are not copied into the change log"""
+
+
 class LightDB(dict):
     """Light Database
     ~~~~~~~~~~~~~~
@@ -18,19 +49,92 @@ class LightDB(dict):
     This class extends the built-in Python `dict` class to provide a simple and easy-to-use
     key-value store that persists its data in a JSON file. The class provides methods to set, get,
     and remove individual key-value pairs.
+
+    When ``max_memory`` or ``max_rows`` is set, the least recently used tables are spilled to their
+    own segment files next to the database file whenever the limits are exceeded, and paged back in
+    transparently on the next access. Spilled tables stay part of ``keys()``, ``len()`` and iteration,
+    while ``items()`` and ``values()`` page them in one by one. The size of a table is measured as the
+    length of its JSON encoding, which is smaller than the memory used by the Python objects.
+
+    The database file and the segments can be compressed with one of the standard library formats
+    listed in ``COMPRESSIONS``. Data is streamed through the compressor, and the format of existing
+    files is detected automatically on load.
+
+    With ``snapshot`` enabled, the parsed data is also kept in a pickle sidecar file next to the
+    database file. The sidecar is loaded instead of parsing the JSON file whenever its recorded size,
+    modification time and checksum match the database file. ``save()`` removes the sidecar, and the
+    next load rebuilds it from the parsed JSON file, so it always holds exactly what parsing the file would.
+
+    Every ``set()``, ``pop()`` and model save or delete is recorded as a ``Change``. Changes are delivered
+    to the callbacks registered with ``watch()`` and kept in a bounded log readable with ``changes_since()``.
+
+    The counters of ``autoincrement`` model ids are kept in ``sequences``, outside of the database keys.
+    They are stored in the database file under the reserved ``"__sequences__"`` key and survive ``reset()``.
     """
 
     _current_db: "LightDB" = None
 
-    def __init__(self, location: str) -> None:
+    def __init__(
+        self,
+        location: str,
+        max_memory: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        compression: Optional[str] = None,
+        table_compression: Optional[Dict[str, Optional[str]]] = None,
+        snapshot: bool = False,
+        changelog_size: int = 10000
+    ) -> None:
         """Initialize the LightDB object
 
         Params:
             location (``str``): The path to the JSON file where the database is stored
+
+            max_memory (``int``, optional): The maximum size of the tables kept in memory, measured as the
+                length of their JSON encoding
+
+            max_rows (``int``, optional): The maximum number of rows of the tables kept in memory
+
+            compression (``str``, optional): The compression of the database file, one of ``"zlib"``, ``"gzip"``
+                or ``"lzma"``. Defaults to the compression of the existing file
+
+            table_compression (``Dict[str, str]``, optional): The compression of the segment files of
+                individual tables. Defaults to ``compression``
+
+            snapshot (``bool``, optional): Whether to keep a binary snapshot sidecar for faster loading
+
+            changelog_size (``int``, optional): The maximum number of changes kept for ``changes_since()``
         """
         super().__init__()
         self.location = Path(location)
-        self.update(**self._load())
+        self.compression = compression
+        self.table_compression = table_compression or {}
+
+        for mode in [compression, *self.table_compression.values()]:
+            if mode is not None and mode not in COMPRESSIONS:
+                raise ValueError(f"Unsupported compression `{mode}`, expected one of {', '.join(COMPRESSIONS)}")
+
+        if compression is None and self.location.exists():
+            self.compression = detect_compression(self.location)
+
+        self.max_memory = max_memory
+        self.max_rows = max_rows
+        self.segments_location = self.location.with_name(f"{self.location.name}.segments")
+        self.snapshot = snapshot
+        self.snapshot_location = self.location.with_name(f"{self.location.name}.snapshot")
+
+        self._spilled: Dict[str, Path] = {}
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+
+        self._seq = 0
+        self._changes: Deque[Change] = deque(maxlen=changelog_size)
+        self._watchers: Dict[str, List[Callable[[Change], Any]]] = {}
+        self._versions: Dict[str, int] = {}
+
+        data = self._load()
+        self.sequences: Dict[str, int] = data.pop(SEQUENCES_KEY, {})
+        self.update(**data)
+        self._recent.update(dict.fromkeys(self))
+        self._enforce_limits()
 
         LightDB._current_db = self
 
@@ -60,13 +164,246 @@ class LightDB(dict):
         if not self.location.exists():
             return {}
 
-        with self.location.open("r", encoding="utf-8") as file:
-            return json.load(file)
+        if self.snapshot:
+            data = self._load_snapshot()
+            if data is not None:
+                return data
+
+        with open_text(self.location, "r") as file, _gc_paused():
+            data = json.load(file)
+
+        if self.snapshot:
+            self._save_snapshot(data)
+
+        return data
+
+    def _fingerprint(self) -> Tuple[int, int, int]:
+        """Compute the fingerprint of the database file
+
+        Returns:
+            ``Tuple[int, int, int]``: The size, the modification time in nanoseconds and the CRC32 checksum of the file
+        """
+        stat = self.location.stat()
+        checksum = 0
+        with self.location.open("rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                checksum = zlib.crc32(chunk, checksum)
+
+        return stat.st_size, stat.st_mtime_ns, checksum
+
+    def _load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Load the data from the snapshot sidecar if it matches the database file
+
+        Returns:
+            ``Dict[str, Any]`` | ``None``: The loaded key-value pairs, or None if the snapshot is missing or stale
+        """
+        if not self.snapshot_location.exists():
+            return None
+
+        try:
+            with self.snapshot_location.open("rb") as file:
+                size, mtime, digest = pickle.load(file)
+                stat = self.location.stat()
+                if (size, mtime) != (stat.st_size, stat.st_mtime_ns) or (size, mtime, digest) != self._fingerprint():
+                    return None
+
+                with _gc_paused():
+                    return pickle.load(file)
+        except Exception:
+            return None
+
+    def _save_snapshot(self, data: Dict[str, Any]) -> None:
+        """Write the snapshot sidecar for the current database file
+
+        Params:
+            data (``Dict[str, Any]``): The key-value pairs stored in the database file
+        """
+        with self.snapshot_location.open("wb") as file:
+            pickle.dump(self._fingerprint(), file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
 
     def save(self) -> None:
         """Save the current state of the database to a JSON file"""
-        with self.location.open("w", encoding="utf-8") as file:
-            json.dump(self, file, ensure_ascii=False, indent=4)
+        with open_text(self.location, "w", self.compression) as file:
+            if not self._spilled:
+                data = dict(dict.items(self))
+                if self.sequences:
+                    data[SEQUENCES_KEY] = self.sequences
+
+                json.dump(data, file, ensure_ascii=False, indent=4)
+            else:
+                self._dump_with_segments(file)
+
+        if self.snapshot:
+            self.snapshot_location.unlink(missing_ok=True)
+
+        self._enforce_limits()
+
+    def _dump_with_segments(self, file) -> None:
+        """Write the resident and the spilled tables to a file as a single JSON object
+
+        Spilled segments are copied to the file as they are, without being loaded into memory
+
+        Params:
+            file (``TextIO``): The file to write to
+        """
+        separator = "{\n"
+        for key, value in dict.items(self):
+            file.write(f"{separator}{_encode_key(key)}: ")
+            json.dump(value, file, ensure_ascii=False, indent=4)
+            separator = ",\n"
+
+        for key, path in self._spilled.items():
+            file.write(f"{separator}{_encode_key(key)}: ")
+            with open_text(path, "r") as segment:
+                shutil.copyfileobj(segment, file)
+            separator = ",\n"
+
+        if self.sequences:
+            file.write(f"{separator}{_encode_key(SEQUENCES_KEY)}: ")
+            json.dump(self.sequences, file, ensure_ascii=False, indent=4)
+
+        file.write("\n}")
+
+    def __getitem__(self, key: str) -> Any:
+        self._page_in(key)
+        self._touch(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._discard_segment(key)
+        super().__setitem__(key, value)
+        self._touch(key)
+        self._bump_version(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._spilled:
+            self._discard_segment(key)
+        else:
+            super().__delitem__(key)
+
+        self._recent.pop(key, None)
+        self._bump_version(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return super().__contains__(key) or key in self._spilled
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([*super().__iter__(), *self._spilled])
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self._spilled)
+
+    def keys(self) -> KeysView:
+        return KeysView(self)
+
+    def items(self) -> ItemsView:
+        return ItemsView(self)
+
+    def values(self) -> ValuesView:
+        return ValuesView(self)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._page_in(key)
+        self._touch(key)
+        return super().setdefault(key, default)
+
+    def _touch(self, key: str) -> None:
+        """Mark a key as the most recently used one
+
+        Params:
+            key (``str``): The accessed key
+        """
+        if super().__contains__(key):
+            self._recent[key] = None
+            self._recent.move_to_end(key)
+
+    def _page_in(self, key: str) -> None:
+        """Load a spilled table back into memory
+
+        Params:
+            key (``str``): The key of the table to load
+        """
+        path = self._spilled.pop(key, None)
+        if path is None:
+            return
+
+        with open_text(path, "r") as segment:
+            super().__setitem__(key, json.load(segment))
+
+        path.unlink()
+        self._touch(key)
+        self._enforce_limits()
+
+    def _spill(self, key: str) -> None:
+        """Move a resident table out of memory to its own segment file
+
+        Params:
+            key (``str``): The key of the table to spill
+        """
+        self.segments_location.mkdir(parents=True, exist_ok=True)
+        path = self.segments_location / f"{hashlib.sha1(repr(key).encode('utf-8')).hexdigest()}.json"
+
+        with open_text(path, "w", self.table_compression.get(key, self.compression)) as segment:
+            json.dump(super().pop(key), segment, ensure_ascii=False, indent=4)
+
+        self._recent.pop(key, None)
+        self._spilled[key] = path
+
+    def _discard_segment(self, key: str) -> None:
+        """Remove the segment of a spilled table without loading it
+
+        Params:
+            key (``str``): The key of the table
+        """
+        path = self._spilled.pop(key, None)
+        if path is not None:
+            path.unlink()
+
+    def _enforce_limits(self) -> None:
+        """Spill the least recently used tables until the resident tables fit into the limits
+
+        The most recently used table always stays in memory
+        """
+        if self.max_memory is None and self.max_rows is None:
+            return
+
+        sizes = {key: _table_size(value, self.max_memory is not None) for key, value in dict.items(self)}
+        total_rows = sum(rows for rows, _ in sizes.values())
+        total_bytes = sum(size for _, size in sizes.values())
+
+        untracked = [key for key in sizes if key not in self._recent]
+        order = untracked + [key for key in self._recent if key in sizes]
+
+        for key in order[:-1]:
+            if (
+                (self.max_rows is None or total_rows <= self.max_rows)
+                and (self.max_memory is None or total_bytes <= self.max_memory)
+            ):
+                break
+
+            rows, size = sizes[key]
+            self._spill(key)
+            total_rows -= rows
+            total_bytes -= size
+
+    def resident_size(self) -> Dict[str, int]:
+        """Returns the accounting of the data kept in memory
+
+        ``json_bytes`` is the length of the JSON encoding of the resident tables, the limit ``max_memory``
+        is compared against. It is not the memory used by the Python objects, which is several times larger
+
+        Returns:
+            ``Dict[str, int]``: The number of resident ``tables``, their ``rows`` and ``json_bytes``,
+                and the number of ``spilled`` tables
+        """
+        sizes = [_table_size(value, True) for value in dict.values(self)]
+        return {
+            "tables": len(sizes),
+            "rows": sum(rows for rows, _ in sizes),
+            "json_bytes": sum(size for _, size in sizes),
+            "spilled": len(self._spilled)
+        }
 
     def set(self, key: str, value: Any) -> None:
         """Set a key-value pair in the database
@@ -76,7 +413,9 @@ class LightDB(dict):
 
             value (``Any``): The value to associate with the key
         """
+        op = "update" if key in self else "insert"
         self[key] = value
+        self.record_change(key, op, None if isinstance(value, list) else value)
 
     @overload
     def get(self, key: str) -> Union[_VT, _T]:
@@ -97,6 +436,8 @@ class LightDB(dict):
         Returns:
             ``_VT`` | ``_T``: The value associated with the key, or the default value if the key doesn`t exist
         """
+        self._page_in(key)
+        self._touch(key)
         return super().get(key, default)
 
     def pop(self, key: str) -> Any:
@@ -108,8 +449,291 @@ class LightDB(dict):
         Returns:
             ``Any``: The removed key-value pair
         """
-        return super().pop(key)
+        self._page_in(key)
+        self._recent.pop(key, None)
+        value = super().pop(key)
+        self.record_change(key, "delete", None if isinstance(value, list) else value)
+        return value
 
     def reset(self) -> None:
         """Reset the database"""
         return self.clear()
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        for key in [*self, *self._versions]:
+            self._bump_version(key)
+
+        for key in list(self._spilled):
+            self._discard_segment(key)
+
+        self._recent.clear()
+        super().clear()
+
+    def popitem(self) -> Tuple[str, Any]:
+        if not super().__len__() and self._spilled:
+            self._page_in(next(reversed(self._spilled)))
+
+        key, value = super().popitem()
+        self._recent.pop(key, None)
+        self._bump_version(key)
+        return key, value
+
+    @property
+    def last_seq(self) -> int:
+        """The sequence number of the latest change, or 0 if nothing has changed yet"""
+        return self._seq
+
+    def table_version(self, table: str) -> int:
+        """Returns the version of a table, which changes whenever the table is changed through the database
+
+        Params:
+            table (``str``): The name of the table
+
+        Returns:
+            ``int``: The version of the table
+        """
+        return self._versions.get(table, 0)
+
+    def _bump_version(self, table: str) -> None:
+        """Mark a table as changed, invalidating everything cached for its previous version
+
+        Params:
+            table (``str``): The name of the changed table
+        """
+        self._versions[table] = self._versions.get(table, 0) + 1
+
+    def record_change(self, table: str, op: str, data: Any) -> Change:
+        """Record a change of a table and deliver it to the watchers of the table
+
+        Params:
+            table (``str``): The name of the changed table
+
+            op (``str``): The kind of the change, one of ``"insert"``, ``"update"`` or ``"delete"``
+
+            data (``Any``): The inserted or updated value, or the deleted one. It is copied, so later
+                changes of the value don`t alter the recorded change
+
+        Returns:
+            ``Change``: The recorded change
+        """
+        self._bump_version(table)
+        self._seq += 1
+        change = Change(self._seq, table, op, copy.deepcopy(data))
+        self._changes.append(change)
+
+        for callback in list(self._watchers.get(table, [])):
+            callback(change)
+
+        return change
+
+    def watch(self, table: str, callback: Callable[[Change], Any]) -> Callable[[], None]:
+        """Register a callback called with every change of a table
+
+        Params:
+            table (``str``): The name of the table to watch
+
+            callback (``Callable[[Change], Any]``): The function to call with each ``Change``
+
+        Returns:
+            ``Callable[[], None]``: A function that unregisters the callback
+        """
+        self._watchers.setdefault(table, []).append(callback)
+
+        def unwatch() -> None:
+            callbacks = self._watchers.get(table, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+        return unwatch
+
+    def changes_since(self, seq: int, table: Optional[str] = None) -> List[Change]:
+        """Returns the changes recorded after a sequence number
+
+        Raises ``ChangesExpiredError`` if the changes after ``seq`` are no longer kept, or if ``seq`` is
+        ahead of the log, e.g. a cursor kept from another database instance
+
+        Params:
+            seq (``int``): The sequence number of the last processed change, 0 to read from the start
+
+            table (``str``, optional): The name of the table to return the changes of. Defaults to all tables
+
+        Returns:
+            ``List[Change]``: The changes with a greater sequence number, oldest first
+        """
+        if seq > self._seq:
+            raise ChangesExpiredError(f"Change {seq} is ahead of the change log of this database, the latest change is {self._seq}")
+
+        oldest = self._changes[0].seq if self._changes else self._seq + 1
+        if seq < oldest - 1:
+            raise ChangesExpiredError(f"Changes after {seq} are no longer in the change log, the oldest kept change is {oldest}")
+
+        start = max(seq - oldest + 1, 0)
+        return [
+            change
+            for change in itertools.islice(self._changes, start, None)
+            if table is None or change.table == table
+        ]
+
+    def export_table(self, table: str, path: Union[str, Path]) -> int:
+        """Export the rows of a table to a newline-delimited JSON (NDJSON) file
+
+        Rows are encoded and written one at a time, so the whole export is never built in memory
+
+        Params:
+            table (``str``): The name of the table to export
+
+            path (``str`` | ``Path``): The path to the NDJSON file to write
+
+        Returns:
+            ``int``: The number of exported rows
+        """
+        count = 0
+        with Path(path).open("w", encoding="utf-8") as file:
+            for row in self.get(table, []):
+                file.write(json.dumps(row, ensure_ascii=False))
+                file.write("\n")
+                count += 1
+        return count
+
+    def import_table(
+        self,
+        table: str,
+        path: Union[str, Path],
+        batch_size: int = 1000,
+        prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    ) -> int:
+        """Import rows from a newline-delimited JSON (NDJSON) file into a table
+
+        The file is streamed, prepared and merged into the table in batches of ``batch_size`` rows.
+        Rows with an ``_id`` that already exists in the table replace the stored row, all other rows
+        are appended. The rows replaced so far are kept aside, so a failing row rolls the table back
+        to its previous state. The database is written to disk once, after the last batch
+
+        Params:
+            table (``str``): The name of the table to import into
+
+            path (``str`` | ``Path``): The path to the NDJSON file to read
+
+            batch_size (``int``, optional): The number of rows to read and prepare at once
+
+            prepare (``Callable``, optional): A function applied to every row before it is stored,
+                e.g. to validate it or fill in defaults
+
+        Returns:
+            ``int``: The number of imported rows
+        """
+        created = table not in self
+        rows: List[Dict[str, Any]] = self.setdefault(table, [])
+        positions = {row["_id"]: index for index, row in enumerate(rows) if isinstance(row, dict) and "_id" in row}
+        length = len(rows)
+        replaced: Dict[int, Dict[str, Any]] = {}
+        changes = []
+
+        try:
+            for batch in _read_ndjson(path, batch_size):
+                for row in batch:
+                    if prepare is not None:
+                        row = prepare(row)
+
+                    index = positions.get(row.get("_id"))
+                    if index is None:
+                        if "_id" in row:
+                            positions[row["_id"]] = len(rows)
+                        rows.append(row)
+                        changes.append(("insert", row))
+                    else:
+                        if index < length:
+                            replaced.setdefault(index, rows[index])
+                        rows[index] = row
+                        changes.append(("update", row))
+
+            self.save()
+        except BaseException:
+            del rows[length:]
+            for index, row in replaced.items():
+                rows[index] = row
+            if created:
+                del self[table]
+            raise
+
+        for op, row in changes:
+            self.record_change(table, op, row)
+
+        return len(changes)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while a large number of containers is being allocated"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _encode_key(key: Any) -> str:
+    """Encode a key the way ``json.dump`` encodes the keys of a dictionary
+
+    Params:
+        key (``Any``): The key to encode
+
+    Returns:
+        ``str``: The encoded key, always a JSON string
+    """
+    return json.dumps({key: None}, ensure_ascii=False)[1:-len(": null}")]
+
+
+def _table_size(value: Any, measure_bytes: bool) -> Tuple[int, int]:
+    """Measure the size of a stored value
+
+    Params:
+        value (``Any``): The stored value
+
+        measure_bytes (``bool``): Whether to measure the length of the JSON encoding, which requires encoding the value
+
+    Returns:
+        ``Tuple[int, int]``: The number of rows (1 for non-list values) and the length of the JSON encoding
+    """
+    rows = len(value) if isinstance(value, list) else 1
+    size = len(json.dumps(value, ensure_ascii=False)) if measure_bytes else 0
+    return rows, size
+
+
+def _read_ndjson(path: Union[str, Path], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Read a newline-delimited JSON file in batches of rows
+
+    Params:
+        path (``str`` | ``Path``): The path to the NDJSON file to read
+
+        batch_size (``int``): The maximum number of rows in a batch
+
+    Returns:
+        ``Iterator[List[Dict[str, Any]]]``: An iterator over lists of decoded rows
+    """
+    if batch_size < 1:
+        raise ValueError("`batch_size` must be a positive integer")
+
+    batch = []
+    with Path(path).open("r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f"Expected a JSON object on line {number} of {path}, got `{type(row).__name__}`")
+
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
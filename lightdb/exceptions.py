@@ -14,3 +14,7 @@ class FieldNotFoundError(Error, ValueError):
 
 class NoArgsProvidedError(Error, TypeError):
     """Exception raised when no arguments are provided to a method that requires at least one argument"""
+
+
+class ChangesExpiredError(Error, LookupError):
+    """Exception raised when the requested changes are no longer kept in the change log"""
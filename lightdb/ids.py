@@ -0,0 +1,140 @@
+"""A file containing the primary key generation strategies of models"""
+
+import os
+import threading
+import time
+import uuid
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Sequence
+
+ID_STRATEGIES = ("uuid4", "autoincrement", "ulid")
+"""The names of the built-in strategies, a callable returning a new id can be used as well"""
+
+ORDERED_ID_STRATEGIES = ("autoincrement", "ulid")
+"""The strategies generating ids that increase over time"""
+
+SEQUENCES_KEY = "__sequences__"
+"""The reserved key under which the counters of ``autoincrement`` tables are stored in the database file"""
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_RANDOMNESS_BITS = 80
+_ulid_lock = threading.Lock()
+_last_timestamp = 0
+_last_randomness = 0
+
+
+def uuid4() -> str:
+    """Generate a random UUID version 4 string
+
+    Returns:
+        ``str``: The generated id
+    """
+    return str(uuid.uuid4())
+
+
+def ulid() -> str:
+    """Generate a ULID: a 26 characters long, lexicographically sortable, time-ordered id
+
+    Ids generated within the same millisecond by this process keep increasing
+
+    Returns:
+        ``str``: The generated id
+    """
+    global _last_timestamp, _last_randomness
+
+    with _ulid_lock:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp <= _last_timestamp:
+            timestamp = _last_timestamp
+            randomness = _last_randomness + 1
+            if randomness >> _RANDOMNESS_BITS:
+                timestamp += 1
+                randomness = int.from_bytes(os.urandom(10), "big")
+        else:
+            randomness = int.from_bytes(os.urandom(10), "big")
+
+        _last_timestamp, _last_randomness = timestamp, randomness
+
+    value = timestamp << _RANDOMNESS_BITS | randomness
+    chars = []
+    for _ in range(26):
+        chars.append(CROCKFORD_BASE32[value & 31])
+        value >>= 5
+
+    return "".join(reversed(chars))
+
+
+def next_sequence(sequences: Dict[str, int], table: str, rows: List[Dict[str, Any]], is_sorted: bool = False) -> int:
+    """Increment and return the counter of an ``autoincrement`` table
+
+    The new id is greater than both the counter and every integer id stored in the table, so ids
+    that got into the table some other way (imports, explicit ids) are never generated again
+
+    Params:
+        sequences (``Dict[str, int]``): The stored counters of the tables
+
+        table (``str``): The name of the table
+
+        rows (``List[Dict[str, Any]]``): The rows of the table
+
+        is_sorted (``bool``, optional): Whether the rows are sorted by ``_id``, so the last row holds the greatest id
+
+    Returns:
+        ``int``: The new id
+    """
+    last_id = rows[-1].get("_id") if rows else None
+    if is_sorted and isinstance(last_id, int):
+        largest = last_id
+    else:
+        largest = max((row["_id"] for row in rows if isinstance(row.get("_id"), int)), default=0)
+
+    sequences[table] = max(sequences.get(table, 0), largest) + 1
+    return sequences[table]
+
+
+class IdView(Sequence):
+    """A read-only sequence of the ids of table rows, used for binary search"""
+
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.rows[index].get("_id")
+
+
+def find_id(rows: List[Dict[str, Any]], _id: Any) -> int:
+    """Find the index of a row by its id in rows sorted by id
+
+    Params:
+        rows (``List[Dict[str, Any]]``): The rows sorted by ``_id``
+
+        _id (``Any``): The id to find
+
+    Returns:
+        ``int``: The index of the row, or -1 if there is no row with the id
+    """
+    try:
+        index = bisect_left(IdView(rows), _id)
+    except TypeError:
+        return -1
+
+    return index if index < len(rows) and rows[index].get("_id") == _id else -1
+
+
+def after_id(rows: List[Dict[str, Any]], _id: Any) -> int:
+    """Find the index of the first row with a greater id in rows sorted by id
+
+    Params:
+        rows (``List[Dict[str, Any]]``): The rows sorted by ``_id``
+
+        _id (``Any``): The id to search after
+
+    Returns:
+        ``int``: The index of the first row with a greater id
+    """
+    return bisect_right(IdView(rows), _id)
@@ -1,11 +1,12 @@
 """A file containing the implementation of the Model class for database management"""
 
 import copy
-import uuid
 
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
 
-from .core import LightDB
+from . import columnar, ids
+from .core import Change, LightDB
 from .exceptions import ValidationError, NoArgsProvidedError
 from .fields import Field
 from .query import Query
@@ -26,6 +27,15 @@ class ModelMeta(type):
                 raise ValidationError(f"`table` must be of type `str` (`{type(table)}` given)")
 
             attrs["__table__"] = table
+            attrs["__columnar__"] = bool(kwargs.pop("columnar", False))
+            attrs["_column_cache"] = None
+
+            id_strategy = kwargs.pop("id_strategy", "uuid4")
+            if not callable(id_strategy) and id_strategy not in ids.ID_STRATEGIES:
+                raise ValueError(f"`id_strategy` must be a callable or one of {', '.join(ids.ID_STRATEGIES)}")
+
+            attrs["__id_strategy__"] = id_strategy
+            attrs["_id_order"] = None
 
             if not attrs.get("__db__"):
                 attrs["__db__"] = LightDB.current()
@@ -41,9 +51,8 @@ class ModelMeta(type):
                 attrs[field_name] = field
                 fields_map[field_name] = field
 
-            if "_id" not in annotations:
-                annotations["_id"] = str
-                add_field("_id", str, attrs.get("_id"))
+            id_type = annotations.setdefault("_id", int if id_strategy == "autoincrement" else str)
+            add_field("_id", id_type, attrs.get("_id"))
 
             for field_name, field_type in annotations.items():
                 if field_name != "_id":
@@ -59,6 +68,8 @@ class Model(metaclass=ModelMeta):
 
     __table__: str = None
     __db__: LightDB = None
+    __columnar__: bool = False
+    __id_strategy__: Union[str, Callable[[], Any]] = "uuid4"
 
     def __init__(self, **kwargs) -> None:
         """Initializes a new instance of the model with the provided keyword arguments
@@ -69,7 +80,7 @@ class Model(metaclass=ModelMeta):
         self._fields_map: Dict[str, Field] = copy.deepcopy(self._fields_map)
 
         if "_id" not in kwargs:
-            kwargs["_id"] = str(uuid.uuid4())
+            kwargs["_id"] = self._next_id()
 
         for name, field in self._fields_map.items():
             value = kwargs.get(name, field.value if field.value is not None else field.default)
@@ -104,6 +115,78 @@ class Model(metaclass=ModelMeta):
         fields_info = [f"{name}={field.value}" for name, field in self._fields_map.items()]
         return f"{self.__class__.__name__}({', '.join(fields_info)})"
 
+    @classmethod
+    def _next_id(cls) -> Any:
+        """Generates a new id according to the id strategy of the model
+
+        ``autoincrement`` ids are taken from the counter of the table when an instance is created,
+        so instances that are never saved leave gaps in the ids
+
+        Returns:
+            ``Any``: The generated id
+        """
+        strategy = cls.__id_strategy__
+        if callable(strategy):
+            return strategy()
+
+        if strategy == "autoincrement":
+            rows = cls.__db__.get(cls.__table__, [])
+            return ids.next_sequence(cls.__db__.sequences, cls.__table__, rows, cls._ids_sorted(rows))
+
+        if strategy == "ulid":
+            return ids.ulid()
+
+        return ids.uuid4()
+
+    @classmethod
+    def _ids_sorted(cls, rows: List[Dict[str, Any]]) -> bool:
+        """Checks whether the rows of the model table are stored in increasing order of their ids
+
+        Only tables of models with a time-ordered id strategy are checked. The result is cached for
+        the current version of the table and kept up to date by ``save()`` and ``delete()``
+
+        Params:
+            rows (``List[Dict[str, Any]]``): The rows of the model table
+
+        Returns:
+            ``bool``: True if binary search by ``_id`` can be used on the rows, False otherwise
+        """
+        if cls.__id_strategy__ not in ids.ORDERED_ID_STRATEGIES:
+            return False
+
+        key = cls.__db__.table_version(cls.__table__)
+        if cls._id_order is None or cls._id_order[0] != key:
+            view = ids.IdView(rows)
+            try:
+                is_sorted = all(view[index] < view[index + 1] for index in range(len(rows) - 1))
+            except TypeError:
+                is_sorted = False
+
+            cls._id_order = (key, is_sorted)
+
+        return cls._id_order[1]
+
+    @classmethod
+    def _find_row(cls, rows: List[Dict[str, Any]], _id: Any) -> int:
+        """Finds the index of a row of the model table by its id
+
+        Params:
+            rows (``List[Dict[str, Any]]``): The rows of the model table
+
+            _id (``Any``): The id of the row
+
+        Returns:
+            ``int``: The index of the row, or -1 if there is no row with the id
+        """
+        if cls._ids_sorted(rows):
+            return ids.find_id(rows, _id)
+
+        for index, row in enumerate(rows):
+            if row.get("_id") == _id:
+                return index
+
+        return -1
+
     @classmethod
     def create(cls: Type[MODEL], **kwargs) -> MODEL:
         """Creates a new instance of the model with the provided keyword arguments and saves it to the database
@@ -145,22 +228,76 @@ class Model(metaclass=ModelMeta):
 
     def save(self) -> None:
         """Saves the current state of the model instance to the database"""
-        existing_instance = self.get(_id=self._fields_map["_id"].value)
-        if existing_instance:
-            existing_instance.delete()
+        rows = self.__db__.setdefault(self.__table__, [])
+        _id = self._fields_map["_id"].value
+        index = self._find_row(rows, _id)
+
+        new_data = self._as_row()
+        if index == -1:
+            try:
+                is_sorted = self._ids_sorted(rows) and (not rows or ids.IdView(rows)[-1] < _id)
+            except TypeError:
+                is_sorted = False
+
+            rows.append(new_data)
+        else:
+            is_sorted = self._ids_sorted(rows)
+            rows[index] = new_data
 
-        new_data = {name: field.value for name, field in self._fields_map.items()}
-        self.__db__.setdefault(self.__table__, []).append(new_data)
         self.__db__.save()
+        self.__db__.record_change(self.__table__, "insert" if index == -1 else "update", new_data)
+        self._keep_id_order(is_sorted)
+
+    def _as_row(self) -> Dict[str, Any]:
+        """Returns the stored representation of the model instance
+
+        Returns:
+            ``Dict[str, Any]``: A mapping of field names to their current values
+        """
+        return {name: field.value for name, field in self._fields_map.items()}
 
     def delete(self) -> None:
         """Deletes the current instance of the model from the database"""
         rows = self.__db__.get(self.__table__, [])
+        index = self._find_row(rows, self._fields_map["_id"].value)
+        if index == -1:
+            return
 
-        for item in rows:
-            if item["_id"] == self._fields_map["_id"].value:
-                rows.remove(item)
-                self.__db__.save()
+        is_sorted = self._ids_sorted(rows)
+        row = rows.pop(index)
+
+        self.__db__.save()
+        self.__db__.record_change(self.__table__, "delete", row)
+        self._keep_id_order(is_sorted)
+
+    @classmethod
+    def _keep_id_order(cls, is_sorted: bool) -> None:
+        """Carries the cached order of the ids over to the current version of the model table
+
+        Params:
+            is_sorted (``bool``): Whether the rows are still sorted by ``_id`` after the change
+        """
+        if cls.__id_strategy__ in ids.ORDERED_ID_STRATEGIES:
+            cls._id_order = (cls.__db__.table_version(cls.__table__), is_sorted)
+
+    @classmethod
+    def _column_store(cls) -> Optional["columnar.ColumnStore"]:
+        """Returns the columnar representation of the model table, building it if needed
+
+        The columns are rebuilt whenever the version of the table changes, i.e. after any change made
+        through the database or a model. Rows mutated in place outside of them are not detected
+
+        Returns:
+            ``ColumnStore`` | ``None``: The columns of the table, or None if the model isn`t columnar or NumPy isn`t installed
+        """
+        if not cls.__columnar__ or columnar.np is None:
+            return None
+
+        key = cls.__db__.table_version(cls.__table__)
+        if cls._column_cache is None or cls._column_cache.key != key:
+            cls._column_cache = columnar.ColumnStore(cls._fields_map, cls.__db__.get(cls.__table__, []), key)
+
+        return cls._column_cache
 
     @classmethod
     def filter(cls: Type[MODEL], *args, **kwargs) -> List[MODEL]:
@@ -190,3 +327,58 @@ class Model(metaclass=ModelMeta):
         for row in (use_db or cls.__db__).get(cls.__table__, []):
             results.append(cls(**row))
         return results
+
+    @classmethod
+    def subscribe(cls, callback: Callable[[Change], Any]) -> Callable[[], None]:
+        """Registers a callback called with every insert, update and delete of the model table
+
+        Params:
+            callback (``Callable[[Change], Any]``): The function to call with each ``Change``
+
+        Returns:
+            ``Callable[[], None]``: A function that unregisters the callback
+        """
+        return cls.__db__.watch(cls.__table__, callback)
+
+    @classmethod
+    def changes_since(cls, seq: int) -> List[Change]:
+        """Retrieves the changes of the model table recorded after a sequence number
+
+        Params:
+            seq (``int``): The sequence number of the last processed change, 0 to read from the start
+
+        Returns:
+            ``List[Change]``: The changes with a greater sequence number, oldest first
+        """
+        return cls.__db__.changes_since(seq, cls.__table__)
+
+    @classmethod
+    def export_ndjson(cls, path: Union[str, Path]) -> int:
+        """Exports all rows of the model table to a newline-delimited JSON (NDJSON) file
+
+        Params:
+            path (``str`` | ``Path``): The path to the NDJSON file to write
+
+        Returns:
+            ``int``: The number of exported rows
+        """
+        return cls.__db__.export_table(cls.__table__, path)
+
+    @classmethod
+    def import_ndjson(cls, path: Union[str, Path], batch_size: int = 1000) -> int:
+        """Imports rows from a newline-delimited JSON (NDJSON) file into the model table
+
+        Every row is validated against the model fields before it is stored, and rows without
+        an ``_id`` get a new one. Rows whose ``_id`` already exists replace the stored row
+
+        Params:
+            path (``str`` | ``Path``): The path to the NDJSON file to read
+
+            batch_size (``int``, optional): The number of rows to read and validate at once
+
+        Returns:
+            ``int``: The number of imported rows
+        """
+        return cls.__db__.import_table(
+            cls.__table__, path, batch_size=batch_size, prepare=lambda row: cls(**row)._as_row()
+        )
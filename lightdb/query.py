@@ -1,15 +1,47 @@
 """A file containing the implementation of the Query and Condition classes for filtering and querying data"""
 
+import base64
+import heapq
+import itertools
+import json
 import operator
-from typing import TYPE_CHECKING, Any, Dict, List
+import pickle
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from . import ids
 
 if TYPE_CHECKING:
     from .models import MODEL, Field
 
 
+OPERATORS_MAP = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+
+class Page(NamedTuple):
+    """A single page of query results"""
+
+    items: List["MODEL"]
+    """The models of the page"""
+
+    cursor: Optional[str]
+    """An opaque cursor to pass as ``after`` to get the next page, or None if this is the last page"""
+
+
 class Query:
     """A class representing a database query"""
 
+    parallel_threshold: int = 100_000
+    """The minimal number of rows in a table for ``parallel`` scans to be used, smaller tables are always scanned serially"""
+
     def __init__(self, model: "MODEL") -> None:
         """Initialize a new query object
 
@@ -44,16 +76,212 @@ class Query:
 
         return self
 
-    def execute(self) -> List["MODEL"]:
+    def execute(self, parallel: Optional[int] = None) -> List["MODEL"]:
         """Execute the query and return the filtered results
 
+        Params:
+            parallel (``int``, optional): The number of worker processes to scan the table with.
+                Used only when the table has at least ``parallel_threshold`` rows and all conditions
+                can be pickled, otherwise the table is scanned serially
+
         Returns:
             ```List[Model]```: The filtered results of the query
         """
+        rows = self._rows()
+        id_results = self._execute_by_id(rows)
+        if id_results is not None:
+            return id_results
+
+        columnar_results = self._execute_columnar(rows)
+        if columnar_results is not None:
+            return columnar_results
+
+        if self._should_parallelize(rows, parallel):
+            return [self.model(**rows[index]) for index in self._scan_parallel(rows, parallel)]
+
         models = self.model.all()
         filtered_results = [model for model in models if self.evaluate_conditions(model)]
         return filtered_results
 
+    def count(self, parallel: Optional[int] = None) -> int:
+        """Count the number of rows matching the query
+
+        Params:
+            parallel (``int``, optional): The number of worker processes to scan the table with,
+                same as for ``execute``
+
+        Returns:
+            ``int``: The number of matching rows
+        """
+        rows = self._rows()
+        if self._should_parallelize(rows, parallel):
+            return len(self._scan_parallel(rows, parallel))
+
+        return len(self.execute())
+
+    def paginate(self, after: Optional[str] = None, size: int = 20, order_by: Union["Field", str, None] = None) -> Page:
+        """Return a single page of the results, ordered by a field with ``_id`` as a tie-breaker
+
+        Unlike slicing the results of ``execute``, only the models of the requested page are created.
+        Pages ordered by ``_id`` of tables with time-ordered ids resume right after the cursor
+
+        Params:
+            after (``str``, optional): The cursor of the previous page. Defaults to the first page
+
+            size (``int``, optional): The maximum number of models in the page
+
+            order_by (``Field`` | ``str``, optional): The field to order the results by. Defaults to ``_id``
+
+        Returns:
+            ``Page``: The models of the page and the cursor of the next page
+        """
+        if size < 1:
+            raise ValueError("`size` must be a positive integer")
+
+        field = getattr(self.model, order_by) if isinstance(order_by, str) else order_by or getattr(self.model, "_id")
+        rows = self._rows()
+
+        def sort_key(row: Dict[str, Any]) -> Tuple[Any, Any]:
+            return row.get(field.name, field.default), row.get("_id")
+
+        start = _decode_cursor(after, field.name) if after is not None else None
+
+        if field.name == "_id" and self.model._ids_sorted(rows):
+            try:
+                offset = ids.after_id(rows, start[1]) if start is not None else 0
+            except TypeError as error:
+                raise ValueError(f"Invalid cursor `{after}`") from error
+
+            matches = (
+                row
+                for row in itertools.islice(rows, offset, None)
+                if all(condition.evaluate_row(row) for condition in self.conditions)
+            )
+            page_rows = list(itertools.islice(matches, size + 1))
+        else:
+            candidates = rows
+            conditions = self.conditions
+            store = self.model._column_store()
+            selection = store.select(conditions) if store is not None else None
+            if selection is not None:
+                indexes, conditions = selection
+                candidates = [rows[index] for index in indexes]
+
+            matches = (row for row in candidates if all(condition.evaluate_row(row) for condition in conditions))
+            if start is not None:
+                matches = (row for row in matches if _is_after(sort_key(row), start, after))
+
+            try:
+                page_rows = heapq.nsmallest(size + 1, matches, key=sort_key)
+            except TypeError as error:
+                raise ValueError(
+                    f"Can`t order `{self.model.__name__}` by `{field.name}`: missing values or values of different types"
+                ) from error
+
+        cursor = _encode_cursor(field.name, sort_key(page_rows[size - 1])) if len(page_rows) > size else None
+        return Page([self.model(**row) for row in page_rows[:size]], cursor)
+
+    def _execute_by_id(self, rows: List[Dict[str, Any]]) -> Optional[List["MODEL"]]:
+        """Execute the query with a binary search for queries filtering by ``_id`` equality
+
+        Params:
+            rows (``List[Dict[str, Any]]``): The rows of the queried table
+
+        Returns:
+            ``List[Model]`` | ``None``: The filtered results, or None if the rows can`t be searched by ``_id``
+        """
+        id_condition = next(
+            (condition for condition in self.conditions if condition.field.name == "_id" and condition.op == "=="),
+            None
+        )
+        if id_condition is None or not self.model._ids_sorted(rows):
+            return None
+
+        index = ids.find_id(rows, id_condition.value)
+        if index == -1:
+            return []
+
+        model = self.model(**rows[index])
+        return [model] if self.evaluate_conditions(model) else []
+
+    def _execute_columnar(self, rows: List[Dict[str, Any]]) -> Optional[List["MODEL"]]:
+        """Execute the query with vectorized filtering for columnar models
+
+        Params:
+            rows (``List[Dict[str, Any]]``): The rows of the queried table
+
+        Returns:
+            ``List[Model]`` | ``None``: The filtered results, or None if the query can`t be vectorized
+        """
+        store = self.model._column_store()
+        if store is None:
+            return None
+
+        selection = store.select(self.conditions)
+        if selection is None:
+            return None
+
+        indexes, remaining = selection
+        results = []
+        for index in indexes:
+            model = self.model(**rows[index])
+            if all(condition.evaluate(model) for condition in remaining):
+                results.append(model)
+
+        return results
+
+    def _rows(self) -> List[Dict[str, Any]]:
+        """Returns the raw rows of the queried table
+
+        Returns:
+            ``List[Dict[str, Any]]``: The stored rows of the model table
+        """
+        return self.model.__db__.get(self.model.__table__, [])
+
+    def _should_parallelize(self, rows: List[Dict[str, Any]], parallel: Optional[int]) -> bool:
+        """Check whether a table scan should be split across worker processes
+
+        Params:
+            rows (``List[Dict[str, Any]]``): The rows to be scanned
+
+            parallel (``int``, optional): The requested number of worker processes
+
+        Returns:
+            ``bool``: True if the scan should run in parallel, False otherwise
+        """
+        if not rows or not parallel or parallel < 2 or len(rows) < self.parallel_threshold:
+            return False
+
+        try:
+            pickle.dumps(self.conditions)
+        except Exception:
+            return False
+
+        return True
+
+    def _scan_parallel(self, rows: List[Dict[str, Any]], parallel: int) -> List[int]:
+        """Evaluate the conditions against the rows in a process pool
+
+        Params:
+            rows (``List[Dict[str, Any]]``): The rows to be scanned
+
+            parallel (``int``): The number of worker processes
+
+        Returns:
+            ``List[int]``: The indexes of the matching rows, in their original order
+        """
+        chunk_size = -(-len(rows) // (parallel * 4))
+        offsets = range(0, len(rows), chunk_size)
+
+        with ProcessPoolExecutor(max_workers=parallel) as executor:
+            chunks = executor.map(
+                _scan_chunk,
+                [self.conditions] * len(offsets),
+                [rows[offset:offset + chunk_size] for offset in offsets],
+                offsets
+            )
+            return [index for chunk in chunks for index in chunk]
+
     def evaluate_conditions(self, model: "MODEL") -> bool:
         """Evaluate the conditions for a given model
 
@@ -98,13 +326,93 @@ class Condition:
         Returns:
             ``bool``: True if the condition is met, False otherwise
         """
-        operators_map = {
-            "==": operator.eq,
-            "!=": operator.ne,
-            "<": operator.lt,
-            "<=": operator.le,
-            ">": operator.gt,
-            ">=": operator.ge
-        }
         value = getattr(model, self.field.name)
-        return operators_map[self.op](value, self.value)
+        return OPERATORS_MAP[self.op](value, self.value)
+
+    def evaluate_row(self, row: Dict[str, Any]) -> bool:
+        """Evaluate the condition for a raw stored row
+
+        Params:
+            row (``Dict[str, Any]``): The row to evaluate the condition against
+
+        Returns:
+            ``bool``: True if the condition is met, False otherwise
+        """
+        value = row.get(self.field.name, self.field.default)
+        return OPERATORS_MAP[self.op](value, self.value)
+
+
+def _encode_cursor(field_name: str, key: Tuple[Any, Any]) -> str:
+    """Encode the ordering key of the last row of a page into an opaque cursor
+
+    Params:
+        field_name (``str``): The name of the field the results are ordered by
+
+        key (``Tuple[Any, Any]``): The value of the field and the ``_id`` of the row
+
+    Returns:
+        ``str``: The cursor
+    """
+    data = json.dumps([field_name, *key], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def _decode_cursor(cursor: str, field_name: str) -> Tuple[Any, Any]:
+    """Decode a cursor created by ``_encode_cursor``
+
+    Params:
+        cursor (``str``): The cursor
+
+        field_name (``str``): The name of the field the results are ordered by
+
+    Returns:
+        ``Tuple[Any, Any]``: The value of the field and the ``_id`` of the last row of the previous page
+    """
+    try:
+        cursor_field, value, _id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid cursor `{cursor}`") from error
+
+    if cursor_field != field_name:
+        raise ValueError(f"The cursor was created for ordering by `{cursor_field}`, not `{field_name}`")
+
+    return value, _id
+
+
+def _is_after(key: Tuple[Any, Any], start: Tuple[Any, Any], cursor: str) -> bool:
+    """Check whether an ordering key comes after the position of a cursor
+
+    Params:
+        key (``Tuple[Any, Any]``): The value of the ordered field and the ``_id`` of a row
+
+        start (``Tuple[Any, Any]``): The decoded cursor
+
+        cursor (``str``): The cursor, for the error message
+
+    Returns:
+        ``bool``: True if the row comes after the cursor, False otherwise
+    """
+    try:
+        return key > start
+    except TypeError as error:
+        raise ValueError(f"Invalid cursor `{cursor}`") from error
+
+
+def _scan_chunk(conditions: List[Condition], rows: List[Dict[str, Any]], offset: int) -> List[int]:
+    """Evaluate conditions against a chunk of rows inside a worker process
+
+    Params:
+        conditions (``List[Condition]``): The conditions to evaluate
+
+        rows (``List[Dict[str, Any]]``): The chunk of rows
+
+        offset (``int``): The index of the first row of the chunk in the table
+
+    Returns:
+        ``List[int]``: The table indexes of the matching rows
+    """
+    return [
+        offset + index
+        for index, row in enumerate(rows)
+        if all(condition.evaluate_row(row) for condition in conditions)
+    ]
@@ -0,0 +1,61 @@
+import os
+import pytest
+
+from lightdb.core import LightDB
+from lightdb.compression import COMPRESSIONS, detect_compression, open_text
+
+
+@pytest.fixture
+def db_location():
+    test_db_location = "test_db.json"
+    yield test_db_location
+    if os.path.exists(test_db_location):
+        os.remove(test_db_location)
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_open_text_round_trip(tmp_path, compression: str):
+    path = tmp_path / "data"
+    text = "".join(f"line {index} ✓\n" for index in range(50_000))
+
+    with open_text(path, "w", compression) as file:
+        file.write(text)
+
+    assert detect_compression(path) == compression
+    assert path.stat().st_size < len(text)
+    with open_text(path, "r") as file:
+        assert file.read() == text
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_lightdb_compression(db_location: str, compression: str):
+    db = LightDB(db_location, compression=compression)
+    db.set("key", "value")
+    db.save()
+
+    assert detect_compression(db_location) == compression
+
+    db2 = LightDB(db_location)
+    assert db2.compression == compression
+    assert db2.get("key") == "value"
+
+
+def test_lightdb_table_compression(db_location: str):
+    db = LightDB(db_location, max_rows=1, compression="gzip", table_compression={"users": "lzma"})
+    db.set("users", [{"_id": "1"}])
+    db.set("posts", [{"_id": "2"}])
+    db.save()
+
+    segment = db._spilled["users"]
+    assert detect_compression(segment) == "lzma"
+
+    db.save()
+    assert LightDB(db_location).get("users") == [{"_id": "1"}]
+
+    db.reset()
+    db.segments_location.rmdir()
+
+
+def test_lightdb_unsupported_compression(db_location: str):
+    with pytest.raises(ValueError):
+        LightDB(db_location, compression="zip")
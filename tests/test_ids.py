@@ -0,0 +1,16 @@
+from lightdb.ids import CROCKFORD_BASE32, after_id, find_id, ulid
+
+
+def test_ulid():
+    generated = [ulid() for _ in range(1000)]
+    assert generated == sorted(generated)
+    assert len(set(generated)) == 1000
+    assert all(len(value) == 26 and set(value) <= set(CROCKFORD_BASE32) for value in generated)
+
+
+def test_find_id():
+    rows = [{"_id": value} for value in (1, 3, 5)]
+    assert find_id(rows, 3) == 1
+    assert find_id(rows, 4) == -1
+    assert find_id(rows, "3") == -1
+    assert after_id(rows, 3) == 2
@@ -4,6 +4,7 @@ import pytest
 from pathlib import Path
 
 from lightdb.core import LightDB
+from lightdb.exceptions import ChangesExpiredError
 
 
 @pytest.fixture
@@ -37,3 +38,196 @@ def test_lightdb_reset(db: LightDB):
     db.set("key", "value")
     db.reset()
     assert db.get("key") is None
+
+
+def test_lightdb_export_import_table(db: LightDB, tmp_path: Path):
+    db.set("users", [{"_id": "1", "name": "John"}, {"_id": "2", "name": "Jane"}])
+    path = tmp_path / "users.ndjson"
+
+    assert db.export_table("users", path) == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    db.set("users", [{"_id": "1", "name": "Old"}])
+    changes = []
+    db.watch("users", changes.append)
+    assert db.import_table("users", path, batch_size=1) == 2
+    assert [change.op for change in changes] == ["update", "insert"]
+    assert db.get("users") == [{"_id": "1", "name": "John"}, {"_id": "2", "name": "Jane"}]
+
+    db2 = LightDB("test_db.json")
+    assert len(db2.get("users")) == 2
+
+
+def test_lightdb_spill_tables(db: LightDB):
+    db = LightDB("test_db.json", max_rows=3)
+    db.set("users", [{"_id": "1"}, {"_id": "2"}])
+    db.set("posts", [{"_id": "3"}, {"_id": "4"}])
+    db.save()
+
+    assert "users" in db
+    assert list(db) == ["posts", "users"]
+    assert len(db) == 2
+    assert db.resident_size()["rows"] == 2
+    assert db.resident_size()["spilled"] == 1
+
+    db2 = LightDB("test_db.json")
+    assert db2.get("users") == [{"_id": "1"}, {"_id": "2"}]
+    assert db2.get("posts") == [{"_id": "3"}, {"_id": "4"}]
+
+    assert db.get("users") == [{"_id": "1"}, {"_id": "2"}]
+    assert db.resident_size()["spilled"] == 1
+    assert dict(db.items()) == {"users": [{"_id": "1"}, {"_id": "2"}], "posts": [{"_id": "3"}, {"_id": "4"}]}
+
+    del db["users"]
+    assert "users" not in db
+    assert list(db.keys()) == ["posts"]
+
+    db.reset()
+    assert not any(db.segments_location.iterdir())
+    db.segments_location.rmdir()
+
+
+def test_lightdb_snapshot(db: LightDB, monkeypatch):
+    db = LightDB("test_db.json", snapshot=True)
+    db.set("key", "value")
+    db.save()
+    assert not db.snapshot_location.exists()
+
+    assert LightDB("test_db.json", snapshot=True).get("key") == "value"
+    assert db.snapshot_location.exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON file was parsed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("lightdb.core.json.load", fail)
+        assert LightDB("test_db.json", snapshot=True).get("key") == "value"
+
+    Path("test_db.json").write_text('{"key": "changed"}', encoding="utf-8")
+    assert LightDB("test_db.json", snapshot=True).get("key") == "changed"
+
+    db.snapshot_location.unlink()
+
+
+def test_lightdb_changes(db: LightDB):
+    changes = []
+    unwatch = db.watch("key", changes.append)
+
+    db.set("key", "value")
+    db.set("key", "other")
+    db.pop("key")
+    unwatch()
+    db.set("key", "value")
+
+    assert [(change.seq, change.op, change.data) for change in changes] == [
+        (1, "insert", "value"), (2, "update", "other"), (3, "delete", "other")
+    ]
+    assert [change.seq for change in db.changes_since(2)] == [3, 4]
+    assert db.changes_since(db.last_seq) == []
+
+
+def test_lightdb_changes_expired():
+    db = LightDB("test_db.json", changelog_size=2)
+    for index in range(3):
+        db.set(f"key{index}", index)
+
+    assert [change.seq for change in db.changes_since(1)] == [2, 3]
+    with pytest.raises(ChangesExpiredError):
+        db.changes_since(0)
+    with pytest.raises(ChangesExpiredError):
+        db.changes_since(500)
+
+
+def test_lightdb_delete_spilled_table(db: LightDB):
+    db = LightDB("test_db.json", max_rows=1)
+    db.set("users", [{"_id": "1"}])
+    db.set("posts", [{"_id": "2"}])
+    db.save()
+    segment = db._spilled["users"]
+
+    del db["users"]
+    assert "users" not in db
+    assert not segment.exists()
+    with pytest.raises(KeyError):
+        del db["users"]
+
+    db.segments_location.rmdir()
+
+
+def test_lightdb_snapshot_matches_json(db: LightDB):
+    db = LightDB("test_db.json", snapshot=True)
+    shared = [1, 2]
+    db.set("k", (1, 2))
+    db.set(1, "x")
+    db.set("shared", {"a": shared, "b": shared})
+    db.save()
+
+    LightDB("test_db.json", snapshot=True)
+    loaded = LightDB("test_db.json", snapshot=True)
+    assert loaded == LightDB("test_db.json")
+    assert loaded["k"] == [1, 2]
+    assert loaded["1"] == "x" and 1 not in loaded
+    assert loaded["shared"]["a"] is not loaded["shared"]["b"]
+
+    db.snapshot_location.write_bytes(b"\x80\x05corrupted")
+    assert LightDB("test_db.json", snapshot=True)["k"] == [1, 2]
+
+    db.save()
+    assert not db.snapshot_location.exists()
+
+
+def test_lightdb_import_table_rejects_non_objects(db: LightDB, tmp_path: Path):
+    db.set("users", [{"_id": "1", "name": "Old"}])
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"_id": "1", "name": "New"}\n{"_id": "2"}\n[1, 2]\n', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="line 3"):
+        db.import_table("users", path, batch_size=1)
+
+    assert db.get("users") == [{"_id": "1", "name": "Old"}]
+
+    with pytest.raises(ValueError):
+        db.import_table("posts", path)
+    assert "posts" not in db
+
+
+def test_lightdb_cli_import_assigns_ids(db: LightDB, tmp_path: Path):
+    from lightdb.__main__ import main
+
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"name": "John"}\n', encoding="utf-8")
+    assert main(["import", "test_db.json", "users", str(path)]) == 0
+
+    rows = LightDB("test_db.json").get("users")
+    assert rows[0]["name"] == "John"
+    assert rows[0]["_id"]
+
+
+def test_lightdb_spill_non_string_keys(db: LightDB):
+    db = LightDB("test_db.json", max_rows=1)
+    db.set(1, "x")
+    db.set("1", "y")
+    db.set("a", "z")
+    db.save()
+    db.save()
+
+    loaded = LightDB("test_db.json")
+    assert loaded["a"] == "z"
+    assert loaded["1"] in ("x", "y")
+    assert db.get(1) == "x"
+    assert db.get("1") == "y"
+
+    db.reset()
+    db.segments_location.rmdir()
+
+
+def test_lightdb_changes_are_copies(db: LightDB):
+    db.set("settings", {"tags": ["a"]})
+    db["settings"]["tags"].append("b")
+    db.set("users", [{"_id": "1"}])
+    db.pop("users")
+
+    changes = db.changes_since(0)
+    assert changes[0].data == {"tags": ["a"]}
+    assert changes[1].data is None
+    assert changes[2].data is None
@@ -3,6 +3,7 @@ import pytest
 
 from typing import Any, List, Dict
 from lightdb.core import LightDB
+from lightdb.exceptions import ValidationError
 from lightdb.models import MODEL, Model
 
 
@@ -68,3 +69,200 @@ def test_model_all(user_model: MODEL):
     
     results = user_model.all()
     assert len(results) == 2
+
+
+def test_model_export_import_ndjson(user_model: MODEL, tmp_path):
+    user_model.create(name="John", age=30)
+    path = tmp_path / "users.ndjson"
+    assert user_model.export_ndjson(path) == 1
+
+    with path.open("a", encoding="utf-8") as file:
+        file.write('{"name": "Jane", "age": 25}\n')
+
+    user_model.__db__.reset()
+    assert user_model.import_ndjson(path) == 2
+
+    results = user_model.all()
+    assert [user.name for user in results] == ["John", "Jane"]
+    assert results[1]._id is not None
+    assert results[1].items == []
+
+
+def test_model_import_ndjson_validates(user_model: MODEL, tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"name": "John", "age": "thirty"}\n', encoding="utf-8")
+
+    with pytest.raises(ValidationError):
+        user_model.import_ndjson(path)
+
+
+def test_model_subscribe(user_model: MODEL):
+    changes = []
+    user_model.subscribe(changes.append)
+
+    model = user_model.create(name="John", age=30)
+    model.age = 31
+    model.save()
+    model.delete()
+
+    assert [change.op for change in changes] == ["insert", "update", "delete"]
+    assert changes[1].data["age"] == 31
+    assert user_model.changes_since(changes[0].seq) == changes[1:]
+    assert user_model.all() == []
+
+
+def test_model_id_strategies(user_model: MODEL):
+    db = user_model.__db__
+
+    class Post(Model, table="posts", id_strategy="autoincrement"):
+        title: str
+
+    class Event(Model, table="events", id_strategy="ulid"):
+        name: str
+
+    class Tag(Model, table="tags", id_strategy=lambda: "tag"):
+        name: str
+
+    assert [Post.create(title=title)._id for title in ("a", "b", "c")] == [1, 2, 3]
+    Post.get(_id=3).delete()
+    assert Post.create(title="d")._id == 4
+    assert "__sequences__" not in db
+    assert LightDB("test_db.json").sequences["posts"] == 4
+
+    events = [Event.create(name=str(index)) for index in range(5)]
+    assert [event._id for event in events] == sorted(event._id for event in events)
+    assert Tag.create(name="python")._id == "tag"
+
+    with pytest.raises(ValueError):
+        class Comment(Model, table="comments", id_strategy="random"):
+            text: str
+
+    LightDB._current_db = db
+
+
+def test_model_ordered_ids_lookup(user_model: MODEL):
+    class Post(Model, table="posts", id_strategy="autoincrement"):
+        title: str
+
+    for title in ("a", "b", "c", "d"):
+        Post.create(title=title)
+
+    post = Post.get(_id=2)
+    post.title = "B"
+    post.save()
+
+    rows = Post.__db__.get("posts")
+    assert [row["_id"] for row in rows] == [1, 2, 3, 4]
+    assert Post._ids_sorted(rows)
+    assert Post.get(_id=2).title == "B"
+    assert Post.get(_id=5) is None
+    assert Post.get(Post._id == 2, title="b") is None
+
+
+def test_model_import_ndjson_failure_keeps_table(user_model: MODEL, tmp_path):
+    user_model.create(_id="a", name="John", age=30)
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"_id": "b", "name": "Jane", "age": 25}\n{"_id": "c", "name": "Bob", "age": "old"}\n', encoding="utf-8")
+
+    with pytest.raises(ValidationError):
+        user_model.import_ndjson(path, batch_size=1)
+
+    assert [row["_id"] for row in user_model.__db__.get("users")] == ["a"]
+
+
+def test_model_import_ndjson_failure_records_no_changes(user_model: MODEL, tmp_path):
+    changes = []
+    user_model.subscribe(changes.append)
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"name": "Jane", "age": 25}\n{"name": "Bob", "age": "old"}\n', encoding="utf-8")
+
+    with pytest.raises(ValidationError):
+        user_model.import_ndjson(path)
+
+    assert changes == []
+
+
+def test_model_autoincrement_skips_stored_ids(user_model: MODEL, tmp_path):
+    db = user_model.__db__
+
+    class Post(Model, table="posts", id_strategy="autoincrement"):
+        title: str
+
+    Post.create(title="first")
+    path = tmp_path / "posts.ndjson"
+    path.write_text('{"_id": 2, "title": "imported"}\n', encoding="utf-8")
+    db.import_table("posts", path)
+    assert Post.create(title="new")._id == 3
+
+    Post.create(_id=10, title="explicit")
+    assert Post.create(title="next")._id == 11
+
+    db.set("posts", db.get("posts") + [{"_id": 20, "title": "raw"}])
+    assert Post.create(title="last")._id == 21
+    assert [post.title for post in Post.all()] == ["first", "imported", "new", "explicit", "next", "raw", "last"]
+
+
+def test_model_save_tolerates_rows_without_id(user_model: MODEL, tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text('{"name": "Raw", "age": 3}\n', encoding="utf-8")
+    user_model.__db__.import_table("users", path)
+
+    user = user_model.create(name="John", age=30)
+    user.age = 31
+    user.save()
+    user.delete()
+
+    assert [row["name"] for row in user_model.__db__.get("users")] == ["Raw"]
+
+
+def test_model_changes_are_copies(user_model: MODEL):
+    changes = []
+    user_model.subscribe(changes.append)
+    user_model.create(name="John", age=30)
+
+    user_model.__db__.get("users")[0]["items"].append("book")
+    assert changes[0].data["items"] == []
+
+
+def test_model_autoincrement_survives_reset_and_spill(user_model: MODEL):
+    db = user_model.__db__
+
+    class Post(Model, table="posts", id_strategy="autoincrement"):
+        title: str
+
+    Post.create(title="a")
+    Post.create(title="b")
+    db.reset()
+    assert Post.create(title="c")._id == 3
+
+    db.max_rows = 1
+    user_model.create(name="John", age=30)
+    assert "posts" in db._spilled
+    assert Post.create(title="d")._id == 4
+    assert set(db) == {"posts", "users"}
+
+    db.max_rows = None
+    db.reset()
+    db.segments_location.rmdir()
+
+
+def test_model_ordered_ids_after_update(user_model: MODEL):
+    db = user_model.__db__
+
+    class Post(Model, table="posts", id_strategy="autoincrement"):
+        title: str
+
+    Post.create(title="a")
+    assert Post._ids_sorted(db.get("posts"))
+
+    db.update(posts=[{"_id": 5, "title": "x"}, {"_id": 3, "title": "y"}])
+    assert not Post._ids_sorted(db.get("posts"))
+    assert Post._find_row(db.get("posts"), 3) == 1
+
+    post = Post.get(_id=3)
+    assert post.title == "y"
+
+    post.title = "z"
+    post.save()
+    assert [row["_id"] for row in db.get("posts")] == [5, 3]
+    assert db.get("posts")[1]["title"] == "z"
@@ -4,7 +4,7 @@ import os
 from typing import Any, Dict, List
 
 from lightdb.core import LightDB
-from lightdb.query import Query, Condition
+from lightdb.query import Query, Condition, _encode_cursor
 from lightdb.fields import Field
 from lightdb.models import MODEL, Model
 
@@ -62,3 +62,179 @@ def test_condition_evaluate():
     
     model = TestModelMock()
     assert condition.evaluate(model) == True
+
+
+def test_query_execute_parallel(user_model: MODEL, monkeypatch):
+    monkeypatch.setattr(Query, "parallel_threshold", 0)
+    assert Query(user_model).where(user_model.age >= 10).execute(parallel=2) == []
+
+    for age in range(20):
+        user_model.create(name=f"User{age}", age=age)
+
+    query = Query(user_model).where(user_model.age >= 10)
+    results = query.execute(parallel=2)
+
+    assert [user.age for user in results] == list(range(10, 20))
+    assert query.count(parallel=2) == 10
+    assert query.count() == 10
+
+
+def test_condition_evaluate_row():
+    field = Field(name="age", annotation=int, default=30)
+    assert Condition(field, ">=", 18).evaluate_row({"age": 20})
+    assert Condition(field, "==", 30).evaluate_row({})
+
+
+@pytest.fixture
+def columnar_model():
+    test_db_location = "test_db.json"
+    db = LightDB(test_db_location)
+
+    class Stats(Model, table="stats", columnar=True):
+        name: str
+        score: float
+        visits: int
+        active: bool
+
+    yield Stats
+
+    if os.path.exists(test_db_location):
+        os.remove(test_db_location)
+
+
+def test_query_execute_columnar(columnar_model: MODEL):
+    pytest.importorskip("numpy")
+    for index in range(6):
+        columnar_model.create(name=f"Page{index}", score=index / 2, visits=index, active=index % 2 == 0)
+
+    results = columnar_model.filter(columnar_model.visits >= 2, columnar_model.active == True)
+    assert [stats.name for stats in results] == ["Page2", "Page4"]
+
+    store = columnar_model._column_store()
+    assert set(store.columns) == {"_id", "name", "score", "visits", "active"}
+    assert store.mask(Condition(columnar_model.score, "<", 1)).tolist() == [True, True, False, False, False, False]
+    assert store.mask(Condition(columnar_model.name, "<", "Page3")) is None
+
+    columnar_model.get(name="Page2").delete()
+    assert columnar_model._column_store().size == 5
+    assert len(columnar_model.filter(columnar_model.visits >= 2)) == 3
+
+
+def test_query_execute_columnar_fallback(columnar_model: MODEL, monkeypatch):
+    from lightdb import columnar
+    monkeypatch.setattr(columnar, "np", None)
+
+    columnar_model.create(name="Page", score=1.5, visits=3, active=True)
+    assert columnar_model._column_store() is None
+    assert len(columnar_model.filter(columnar_model.score > 1)) == 1
+
+
+def test_query_paginate(user_model: MODEL):
+    for index in range(7):
+        user_model.create(_id=f"{index:02}", name=f"User{index}", age=index % 3)
+
+    query = Query(user_model).where(user_model.age >= 1)
+    page = query.paginate(size=2, order_by=user_model.age)
+    assert [user._id for user in page.items] == ["01", "04"]
+
+    page = query.paginate(after=page.cursor, size=2, order_by=user_model.age)
+    assert [user._id for user in page.items] == ["02", "05"]
+    assert page.cursor is None
+
+    first_page = Query(user_model).paginate(size=5)
+    assert [user._id for user in first_page.items] == ["00", "01", "02", "03", "04"]
+    page = Query(user_model).paginate(after=first_page.cursor, size=5)
+    assert [user._id for user in page.items] == ["05", "06"]
+    assert page.cursor is None
+
+    with pytest.raises(ValueError):
+        Query(user_model).paginate(after=first_page.cursor, order_by="age")
+    with pytest.raises(ValueError):
+        Query(user_model).paginate(after="invalid")
+
+
+def test_query_paginate_ordered_ids(user_model: MODEL):
+    class Post(Model, table="posts", id_strategy="ulid"):
+        title: str
+
+    posts = [Post.create(title=str(index)) for index in range(5)]
+
+    page = Query(Post).paginate(size=2)
+    assert [post._id for post in page.items] == [post._id for post in posts[:2]]
+
+    page = Query(Post).where(Post.title != "3").paginate(after=page.cursor, size=2)
+    assert [post.title for post in page.items] == ["2", "4"]
+    assert page.cursor is None
+
+
+def test_query_columnar_sees_in_place_updates(columnar_model: MODEL, tmp_path):
+    pytest.importorskip("numpy")
+    columnar_model.create(_id="a", name="Page", score=1.0, visits=1, active=True)
+    assert len(columnar_model.filter(columnar_model.visits == 1)) == 1
+
+    path = tmp_path / "stats.ndjson"
+    path.write_text('{"_id": "a", "name": "Page", "score": 1.0, "visits": 5, "active": true}\n', encoding="utf-8")
+    columnar_model.__db__.import_table("stats", path)
+    assert columnar_model.filter(columnar_model.visits == 1) == []
+    assert len(columnar_model.filter(columnar_model.visits == 5)) == 1
+
+    class OtherStats(Model, table="stats"):
+        name: str
+        score: float
+        visits: int
+        active: bool
+
+    OtherStats(_id="a", name="Page", score=1.0, visits=7, active=True).save()
+    assert [stats.visits for stats in columnar_model.filter(columnar_model.visits == 7)] == [7]
+
+
+def test_query_paginate_mismatched_cursor(user_model: MODEL):
+    user_model.create(_id="a", name="John", age=30)
+    cursor = _encode_cursor("age", (30, 1))
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Query(user_model).paginate(after=cursor, order_by="age")
+
+    class Post(Model, table="posts", id_strategy="autoincrement"):
+        title: str
+
+    Post.create(title="a")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Query(Post).paginate(after=_encode_cursor("_id", ("x", "x")))
+
+
+def test_query_columnar_after_reset_and_update(columnar_model: MODEL):
+    pytest.importorskip("numpy")
+    db = columnar_model.__db__
+    rows = [{"_id": str(index), "name": "Page", "score": 1.0, "visits": index, "active": True} for index in range(5)]
+    db.set("stats", rows)
+    db.save()
+
+    loaded = LightDB("test_db.json")
+    columnar_model.__db__ = loaded
+    try:
+        assert len(columnar_model.filter(columnar_model.visits >= 0)) == 5
+
+        loaded.reset()
+        assert columnar_model.filter(columnar_model.visits >= 0) == []
+
+        loaded.update(stats=rows[:2])
+        assert len(columnar_model.filter(columnar_model.visits >= 0)) == 2
+
+        loaded.popitem()
+        assert columnar_model.filter(columnar_model.visits >= 0) == []
+    finally:
+        columnar_model.__db__ = db
+
+
+def test_query_paginate_unorderable_values(user_model: MODEL):
+    user_model.create(_id="a", name="John", age=30)
+    user_model.create(_id="b", name="Jane", age=25)
+    user_model.__db__.get("users").append({"_id": "c", "name": "Bob", "age": None})
+
+    with pytest.raises(ValueError, match="Can`t order"):
+        Query(user_model).paginate(order_by="age")
+
+    user_model.__db__.get("users")[-1].update(_id=1, age=30)
+    with pytest.raises(ValueError, match="Can`t order"):
+        Query(user_model).paginate(order_by="age")